@@ -0,0 +1,16 @@
+import pytest
+import responses
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mock_api():
+    """Intercept every HTTP request made in a test module with one shared RequestsMock"""
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        yield rsps
+
+
+@pytest.fixture(autouse=True)
+def reset_mock_api(mock_api):
+    """Clear registered responses and recorded calls after each test"""
+    yield
+    mock_api.reset()
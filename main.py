@@ -1,26 +1,58 @@
+import functools
+import json
+import sys
+
 import requests
 
+try:
+    import orjson
+except ImportError:  # orjson is a speedup only; fall back to the stdlib json module
+    orjson = None
+
+@functools.lru_cache(maxsize=2048)
+def _fetch_pokemon(name):
+    """
+    Fetch one Pokemon's raw JSON body from the PokeAPI, remembering the result.
+
+    The cache holds immutable bytes rather than the decoded dict, so no caller
+    can change what the next one gets. HTTP errors are raised rather than
+    returned, so failed requests are never cached and can be retried.
+    """
+    url = f"https://pokeapi.co/api/v2/pokemon/{name}"
+    response = requests.get(url)
+    response.raise_for_status()  # Raises an HTTPError for bad status codes
+    return response.content
+
+
 def get_pokemon_data(pokemon_name):
     """
     Fetch Pokemon data from the PokeAPI.
 
+    Each name is only requested once per process; repeat lookups
+    (in any letter case) are answered from memory. The cached bytes are
+    decoded on every call, so each caller gets its own dict to modify freely.
+
     Args:
         pokemon_name: Name of the Pokemon to fetch
 
     Returns:
         Dictionary containing Pokemon data, or None if request fails
     """
-    url = f"https://pokeapi.co/api/v2/pokemon/{pokemon_name.lower()}"
-
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raises an HTTPError for bad status codes
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        content = _fetch_pokemon(pokemon_name.lower().strip())
+        if orjson:
+            return orjson.loads(content)  # parses the raw bytes directly
+        return json.loads(content)
+    except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
         print(f"Error fetching Pokemon data: {e}")
         return None
 
 if __name__ == "__main__":
+    import requests_cache
+
+    # PokeAPI data is static, so cache responses on disk (pokeapi_cache.sqlite) for a day
+    requests_cache.install_cache("pokeapi_cache", expire_after=86400)
+
     pokemon_name = input("Enter a Pokemon name: ")
     show_raw = input("Show complete raw JSON? (y/n): ").lower().strip() == 'y'
 
@@ -28,11 +60,16 @@ if __name__ == "__main__":
 
     if data:
         if show_raw:
-            import json
-            print("\n" + "="*50)
-            print("COMPLETE RAW JSON DATA")
-            print("="*50)
-            print(json.dumps(data, indent=2))
+            header = "\n" + "="*50 + "\nCOMPLETE RAW JSON DATA\n" + "="*50 + "\n"
+            if orjson:
+                # orjson returns bytes, so send header + JSON to the binary stream
+                # in a single write (flushing the text layer first to keep ordering)
+                sys.stdout.flush()
+                sys.stdout.buffer.write(
+                    header.encode() + orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n"
+                )
+            else:
+                sys.stdout.write(header + json.dumps(data, indent=2) + "\n")
         else:
             print(f"\nPokemon: {data['name'].capitalize()}")
             print(f"Height: {data['height']}")
@@ -1,11 +1,181 @@
 import re
+import sys
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from itertools import chain
+from urllib.parse import unquote
 
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 WIKI_BASE = "https://en.wikipedia.org"
+WIKI_API = f"{WIKI_BASE}/w/api.php"
+API_BATCH_SIZE = 50  # most titles the MediaWiki API accepts per query
 HEADERS = {"User-Agent": "PYT200-064 Class Demo (educational project)"}
+# Website fetches are I/O-bound, so returns keep improving well past 10 threads
+MAX_WORKERS = 32
+# Cap on requests actually on the wire, to stay under Wikipedia's per-client
+# rate limit. Workers beyond this keep parsing pages while others wait to fetch.
+MAX_CONCURRENT_REQUESTS = 20
+_REQUEST_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+# Bytes handed to the list page parser at a time as the response downloads
+PARSE_CHUNK_SIZE = 64 * 1024
+
+# Compiled once at import rather than looked up on every loop iteration
+_CITATION_RE = re.compile(r"\s*\[\s*\d+\s*\]")  # bracketed citation numbers like [15]
+_INFOBOX_CLASS_RE = re.compile(r"(?:^|\s)infobox(?:\s|$)")
+_SORTABLE_CLASS_RE = re.compile(r"(?:^|\s)sortable(?:\s|$)")
+# Infobox "| website = ..." line in a page's wikitext, and the URL inside it,
+# either a bare/bracketed link or {{URL|example.senate.gov}} / {{URL|1=...}}.
+# Only spaces and tabs around "=", so an empty field can't run on into the next line.
+_WEBSITE_PARAM_RE = re.compile(r"^[ \t]*\|[ \t]*website[ \t]*=[ \t]*(.*?)[ \t]*$", re.MULTILINE | re.IGNORECASE)
+_URL_RE = re.compile(r"https?://[^\s|\]}<]+")
+_URL_TEMPLATE_RE = re.compile(r"\{\{\s*URL\s*\|\s*(?:1\s*=\s*)?([^|}\s]+)", re.IGNORECASE)
+
+# Only build the parts of each page we actually read. The class test is a regex
+# because the strainer may see the raw attribute string ("infobox vcard").
+INFOBOX_STRAINER = SoupStrainer("table", class_=_INFOBOX_CLASS_RE)
+
+# Compiled XPath queries for the senators list page, reused for every row so
+# the tree walking happens inside libxml2 rather than in Python loops
+_STATE_CELL = etree.XPath('.//td[@rowspan="2"]')
+_NAME_CELL = etree.XPath(".//th")
+_LINK_HREFS = etree.XPath(".//a/@href")
+_PARTY_CELL = etree.XPath("following-sibling::td[2]")
+_FOOTNOTE_REFS = etree.XPath('.//sup//a/@href[starts-with(., "#cite_note")]')
+_REFERENCE_TEXT = etree.XPath('.//span[contains(concat(" ", normalize-space(@class), " "), " reference-text ")]')
+# Visible text of an element, leaving out footnote markers and inline stylesheets
+_VISIBLE_TEXT = etree.XPath(".//text()[not(ancestor::sup or ancestor::style)]")
+
+
+def make_session(cache_name=None):
+    """
+    Build the Session used for every Wikipedia request.
+
+    One shared Session keeps TLS connections to Wikipedia alive between
+    requests, so the thread pool workers reuse sockets instead of handshaking
+    for every page. With a cache_name it is a requests_cache.CachedSession
+    that stores responses on disk (<cache_name>.sqlite) for a week.
+    """
+    if cache_name:
+        session = requests_cache.CachedSession(cache_name, expire_after=timedelta(weeks=1))
+    else:
+        session = requests.Session()
+    # Set the User-Agent once on the session rather than merging it into every request
+    session.headers.update(HEADERS)
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=MAX_WORKERS,  # one pooled connection per worker, so none wait on the pool
+            # Back off exponentially on throttling/server errors, waiting as long as
+            # a Retry-After header asks, so a busy moment doesn't cost us a senator
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+            ),
+        ),
+    )
+    return session
+
+
+# Importing the module never touches the disk; only running it as a script
+# swaps in the cached session below
+SESSION = make_session()
+
+
+def _text(element, separator=""):
+    """
+    Join an element's visible text pieces, each stripped of surrounding
+    whitespace (like BeautifulSoup's get_text(separator, strip=True)).
+    """
+    return separator.join(piece.strip() for piece in _VISIBLE_TEXT(element) if piece.strip())
+
+
+def _discard(element):
+    """
+    Free a parsed element along with everything that ended before it, so a
+    streaming parse only holds on to the part of the page it is still reading.
+    """
+    element.clear(keep_tail=True)
+    for node in chain((element,), element.iterancestors()):
+        while node.getprevious() is not None:
+            del node.getparent()[0]
+
+
+def _iter_list_page(chunks):
+    """
+    Stream-parse the senators list page from an iterable of byte chunks.
+
+    Yields ("row", <tr>) for each row of the senators table and
+    ("footnote", <li>) for each cite_note footnote as soon as it has been
+    parsed, then frees it once the caller moves on, so only the row or
+    footnote being read (plus whatever the parser hasn't finished) is held
+    in memory rather than the whole page.
+
+    Raises:
+        ValueError: if the page ends without a senators table, so a layout
+            change can't pass for a successful scrape with no senators
+    """
+    # Every element is reported, not just tables and list items, so article text
+    # is freed as it ends too rather than piling up until the next tag of interest
+    parser = etree.HTMLPullParser(events=("start", "end"))
+
+    def events():
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from parser.read_events()
+        parser.close()
+        yield from parser.read_events()
+
+    table = None  # the senators table, while it is being parsed
+    footnote = None  # the cite_note <li> being parsed
+    sortable_seen = 0
+
+    for event, element in events():
+        if event == "start":
+            # The page has several sortable tables; the senators table is the
+            # fourth, with "State" and "Senator" in its header row
+            if element.tag == "table" and _SORTABLE_CLASS_RE.search(element.get("class", "")):
+                sortable_seen += 1
+                if sortable_seen == 4:
+                    table = element
+            elif element.tag == "li" and table is None and element.get("id", "").startswith("cite_note"):
+                footnote = element
+            continue
+
+        # Elements ending inside the table or a footnote are part of a row or
+        # footnote that is still open, so they stay until it ends
+        if table is not None:
+            parent = element.getparent()
+            # Body rows of the senators table itself (not header rows or nested tables)
+            if element.tag == "tr" and (
+                parent is table or (parent.tag == "tbody" and parent.getparent() is table)
+            ):
+                yield "row", element
+                _discard(element)
+            elif element is table:
+                table = None
+                _discard(element)
+        elif footnote is not None:
+            if element is footnote:
+                footnote = None
+                yield "footnote", element
+                _discard(element)
+        else:
+            _discard(element)
+
+    if sortable_seen < 4:
+        raise ValueError(
+            f"Senators table not found: expected 4 sortable tables on the list page, found {sortable_seen}"
+        )
 
 
 def get_senate_website(wiki_path):
@@ -14,114 +184,244 @@ def get_senate_website(wiki_path):
     fetch their page and extract the Senate website URL from the infobox.
     """
     url = f"{WIKI_BASE}{wiki_path}"
-    response = requests.get(url, headers=HEADERS)
+    with _REQUEST_SLOTS:
+        response = SESSION.get(url, timeout=(5, 15))
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    infobox = soup.find("table", class_="infobox")
-    if infobox:
-        for th in infobox.find_all("th"):
-            if "Website" in th.get_text():
-                td = th.find_next_sibling("td")
-                if td:
-                    link = td.find("a")
-                    if link:
-                        return link.get("href", "")
+    # The strainer keeps only the infobox; one CSS selector then jumps from the
+    # "Website" header cell to the link in the data cell right after it
+    soup = BeautifulSoup(response.content, "lxml", parse_only=INFOBOX_STRAINER)
+    link = soup.select_one('th:-soup-contains("Website") + td a')
+    return link.get("href", "") if link else ""
+
+
+def _website_from_wikitext(wikitext):
+    """
+    Pull the website URL out of the infobox "website" field of a page's
+    wikitext, or return "" if the field is missing, empty, or isn't a plain
+    URL (e.g. {{Official URL}}, which is filled in from Wikidata).
+    """
+    # The infobox sits in the lead section; stop before the first heading so
+    # "|website=" fields of citation templates further down can't match
+    lead = wikitext.split("\n==", 1)[0]
+    match = _WEBSITE_PARAM_RE.search(lead)
+    if not match or not match.group(1):
+        return ""
+    value = match.group(1)
+    url = _URL_RE.search(value)
+    if url:
+        return url.group(0)
+    template = _URL_TEMPLATE_RE.search(value)
+    if template:
+        address = template.group(1)
+        return address if "://" in address else f"https://{address}"
     return ""
 
 
-def get_senators():
+def get_websites_from_api(wiki_paths):
     """
-    Scrape the list of current U.S. senators and their states
-    from Wikipedia, then fetch each senator's website in parallel.
+    Look up Senate website URLs in bulk through the MediaWiki API, fetching
+    the wikitext of up to API_BATCH_SIZE pages per request.
 
     Returns:
-        List of tuples: (senator_name, state, party, website, notes)
+        Dict mapping wiki path to website URL, for the paths whose infobox
+        had a usable website field
     """
-    url = f"{WIKI_BASE}/wiki/List_of_current_United_States_senators"
-    response = requests.get(url, headers=HEADERS)
-    response.raise_for_status()
+    # /wiki/Katie_Britt -> "Katie Britt"
+    titles = {path: unquote(path.split("/wiki/", 1)[-1]).replace("_", " ") for path in wiki_paths}
+    title_list = list(dict.fromkeys(titles.values()))
+    wikitext_by_title = {}
+    # The API may answer under a different title than we asked for
+    normalized = {}
+    redirects = {}
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    for start in range(0, len(title_list), API_BATCH_SIZE):
+        params = {
+            "action": "query",
+            "prop": "revisions",
+            "rvprop": "content",
+            "rvslots": "main",
+            "titles": "|".join(title_list[start:start + API_BATCH_SIZE]),
+            "redirects": 1,
+            "format": "json",
+            "formatversion": 2,
+        }
+        # Large batches come back in several parts; keep asking until done
+        while True:
+            with _REQUEST_SLOTS:
+                response = SESSION.get(WIKI_API, params=params, timeout=(5, 15))
+            response.raise_for_status()
+            data = response.json()
+            query = data.get("query", {})
 
-    # The page has several sortable tables; the senators table is the
-    # largest one, with "State" and "Senator" in its header row.
-    tables = soup.find_all("table", class_="sortable")
-    table = tables[3]
-    tbody = table.find("tbody")
-    rows = tbody.find_all("tr")
+            for change in query.get("normalized", []):
+                normalized[change["from"]] = change["to"]
+            for change in query.get("redirects", []):
+                redirects[change["from"]] = change["to"]
+            for page in query.get("pages", []):
+                # Missing pages have no revisions, and hidden revisions have no
+                # content; both are left out so that senator falls back to scraping
+                revisions = page.get("revisions") or [{}]
+                content = revisions[0].get("slots", {}).get("main", {}).get("content")
+                if content is not None:
+                    wikitext_by_title[page["title"]] = content
 
-    senators = []
-    current_state = None
+            if "continue" not in data:
+                break
+            params.update(data["continue"])
+
+    websites = {}
+    for path, title in titles.items():
+        # Follow normalization, then any redirect, to the page we got back
+        title = normalized.get(title, title)
+        title = redirects.get(title, title)
+        website = _website_from_wikitext(wikitext_by_title.get(title, ""))
+        if website:
+            websites[path] = website
+    return websites
+
+
+def get_senate_websites(wiki_paths):
+    """
+    Fetch the Senate website URL for every Wikipedia path.
+
+    Most URLs come from a few batched MediaWiki API requests; any senator the
+    API can't answer for falls back to scraping their page, in parallel.
 
-    for row in rows:
-        # State cells have rowspan="2", spanning both senator rows
-        state_cell = row.find("td", rowspan="2")
-        if state_cell:
-            current_state = state_cell.get_text(strip=True)
-
-        # Senator names are in <th> row header elements
-        name_cell = row.find("th")
-        if name_cell and current_state:
-            name = name_cell.get_text(strip=True)
-            wiki_link = name_cell.find("a")
-            wiki_path = wiki_link["href"] if wiki_link else ""
-
-            # Party is two <td> siblings after the <th>: an empty color cell, then the party name
-            party_cell = name_cell.find_next_sibling("td").find_next_sibling("td")
-
-            # Extract footnote references before getting the clean party text
-            notes = ""
-            footnotes = party_cell.find_all("sup")
-            if footnotes:
-                for sup in footnotes:
-                    link = sup.find("a")
-                    if link and link.get("href", "").startswith("#cite_note"):
-                        ref_id = link["href"].lstrip("#")
-                        ref_li = soup.find("li", id=ref_id)
-                        if ref_li:
-                            # The footnote contains a backlink span ("^ a b")
-                            # and a reference-text span with the actual note
-                            ref_text = ref_li.find("span", class_="reference-text")
-                            if ref_text:
-                                notes = ref_text.get_text(" ", strip=True)
-                                # Remove bracketed citation numbers like [15]
-                                notes = re.sub(r"\s*\[\s*\d+\s*\]", "", notes).strip()
-                    sup.decompose()  # Remove <sup> so it doesn't appear in party text
-
-            party = party_cell.get_text(strip=True)
-            senators.append((name, current_state, party, wiki_path, notes))
-
-    # Fetch all Senate website URLs in parallel using a thread pool
-    print(f"Fetching website URLs for {len(senators)} senators...")
-    websites = [""] * len(senators)
-
-    with ThreadPoolExecutor(max_workers=10) as executor:
+    Returns:
+        List of website URLs in the same order as wiki_paths ("" when a
+        path is empty or its page could not be fetched)
+    """
+    websites = [""] * len(wiki_paths)
+    if not any(wiki_paths):
+        return websites
+
+    try:
+        found = get_websites_from_api([path for path in wiki_paths if path])
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"  Warning: MediaWiki API lookup failed, scraping pages instead: {e}")
+        found = {}
+
+    missing = []
+    for i, wiki_path in enumerate(wiki_paths):
+        if wiki_path in found:
+            websites[i] = found[wiki_path]
+        elif wiki_path:  # only if we have a wiki path
+            missing.append(i)
+    if not missing:
+        return websites
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(missing))) as executor:
         future_to_index = {
-            executor.submit(get_senate_website, senator[3]): i
-            for i, senator in enumerate(senators)
-            if senator[3]  # only if we have a wiki path
+            executor.submit(get_senate_website, wiki_paths[i]): i for i in missing
         }
         for future in as_completed(future_to_index):
             idx = future_to_index[future]
             try:
                 websites[idx] = future.result()
             except Exception as e:
-                print(f"  Warning: could not fetch website for {senators[idx][0]}: {e}")
+                print(f"  Warning: could not fetch website for {wiki_paths[idx]}: {e}")
+
+    return websites
+
+
+def get_senators():
+    """
+    Scrape the list of current U.S. senators and their states
+    from Wikipedia, then fetch each senator's website in parallel.
+
+    Returns:
+        Dict of parallel column lists with keys "name", "state", "party",
+        "website", and "notes" (row i of every column is the same senator).
+        Pass it straight to pandas.DataFrame for column-wise analysis.
+
+    Raises:
+        ValueError: if the list page no longer has the senators table
+    """
+    url = f"{WIKI_BASE}/wiki/List_of_current_United_States_senators"
+
+    senators = {"name": [], "state": [], "party": [], "website": [], "notes": []}
+    wiki_paths = []
+    current_state = None
+    # The footnotes sit below the table, so remember which ids each row cites
+    # and keep the text of only those footnotes as they stream past
+    refs_by_row = []
+    cited = set()
+    notes_by_id = {}
+
+    # Parse the page as it downloads instead of holding all of it first
+    with SESSION.get(url, timeout=(5, 15), stream=True) as response:
+        response.raise_for_status()
+        chunks = response.iter_content(chunk_size=PARSE_CHUNK_SIZE)
+
+        for kind, element in _iter_list_page(chunks):
+            if kind == "footnote":
+                note_id = element.get("id")
+                if note_id in cited:
+                    # The footnote contains a backlink span ("^ a b")
+                    # and a reference-text span with the actual note
+                    ref_texts = _REFERENCE_TEXT(element)
+                    if ref_texts:
+                        # Remove bracketed citation numbers like [15]
+                        notes_by_id[note_id] = _CITATION_RE.sub("", _text(ref_texts[0], " ")).strip()
+                continue
+
+            row = element
+            # State cells have rowspan="2", spanning both senator rows
+            state_cells = _STATE_CELL(row)
+            if state_cells:
+                current_state = _text(state_cells[0])
+
+            # Senator names are in <th> row header elements
+            name_cells = _NAME_CELL(row)
+            if name_cells and current_state:
+                name_cell = name_cells[0]
+                name = _text(name_cell)
+                wiki_links = _LINK_HREFS(name_cell)
+                wiki_path = wiki_links[0] if wiki_links else ""
 
-    # Replace wiki_path with the actual website URL
-    senators = [
-        (name, state, party, websites[i], notes)
-        for i, (name, state, party, _, notes) in enumerate(senators)
-    ]
+                # Party is two <td> siblings after the <th>: an empty color cell, then the party name
+                party_cells = _PARTY_CELL(name_cell)
+                party = ""
+                refs = []
+                if party_cells:
+                    party_cell = party_cells[0]
+                    # _text skips <sup> footnote markers, so the party text comes out clean
+                    party = _text(party_cell)
+                    refs = [ref.lstrip("#") for ref in _FOOTNOTE_REFS(party_cell)]
+                    cited.update(refs)
+
+                senators["name"].append(name)
+                senators["state"].append(current_state)
+                senators["party"].append(party)
+                refs_by_row.append(refs)
+                wiki_paths.append(wiki_path)
+
+    # A senator's note is the last of their footnotes that has any text
+    for refs in refs_by_row:
+        notes = ""
+        for ref in refs:
+            notes = notes_by_id.get(ref, notes)
+        senators["notes"].append(notes)
+
+    # Fetch all Senate website URLs in parallel using a thread pool.
+    # The result is already a column lined up with the others.
+    print(f"Fetching website URLs for {len(wiki_paths)} senators...")
+    senators["website"] = get_senate_websites(wiki_paths)
 
     return senators
 
 
 if __name__ == "__main__":
+    # Re-running the script within a week reads pages from wiki_cache.sqlite
+    SESSION = make_session(cache_name="wiki_cache")
     senators = get_senators()
-    print(f"\n{'Senator':<30} {'State':<20} {'Party':<15} {'Website'}")
-    print("-" * 110)
-    for name, state, party, website, notes in senators:
-        print(f"{name:<30} {state:<20} {party:<15} {website}")
-    print(f"\nTotal: {len(senators)} senators")
+
+    # Build the whole table first and write it once, instead of ~100 print calls
+    lines = [f"\n{'Senator':<30} {'State':<20} {'Party':<15} {'Website'}", "-" * 110]
+    for name, state, party, website in zip(
+        senators["name"], senators["state"], senators["party"], senators["website"]
+    ):
+        lines.append(f"{name:<30} {state:<20} {party:<15} {website}")
+    lines.append(f"\nTotal: {len(senators['name'])} senators")
+    sys.stdout.write("\n".join(lines) + "\n")
@@ -1,12 +1,22 @@
+import pytest
 import requests
-from unittest.mock import Mock
-from main import get_pokemon_data
+import responses
+from main import _fetch_pokemon, get_pokemon_data
+
+POKEAPI_URL = "https://pokeapi.co/api/v2/pokemon/"
+
+
+@pytest.fixture(autouse=True)
+def clear_pokemon_cache():
+    """Forget cached lookups after each test (conftest.py resets the mocked API)"""
+    yield
+    _fetch_pokemon.cache_clear()
 
 
 class TestGetPokemonData:
     """Test suite for the get_pokemon_data function"""
 
-    def test_successful_pokemon_fetch(self, mocker):
+    def test_successful_pokemon_fetch(self, mock_api):
         """Test successful API call returns Pokemon data as dictionary"""
         # Mock response data
         mock_data = {
@@ -18,11 +28,8 @@ class TestGetPokemonData:
             ]
         }
 
-        # Mock the requests.get call
-        mock_response = Mock()
-        mock_response.json.return_value = mock_data
-        mock_response.raise_for_status.return_value = None
-        mocker.patch('requests.get', return_value=mock_response)
+        # Mock the PokeAPI endpoint
+        mock_api.add(responses.GET, POKEAPI_URL + "pikachu", json=mock_data)
 
         # Call the function
         result = get_pokemon_data("pikachu")
@@ -36,39 +43,44 @@ class TestGetPokemonData:
         assert result["types"][0]["type"]["name"] == "electric"
 
         # Verify the API was called with correct URL
-        requests.get.assert_called_once_with("https://pokeapi.co/api/v2/pokemon/pikachu")
+        assert len(mock_api.calls) == 1
+        assert mock_api.calls[0].request.url == "https://pokeapi.co/api/v2/pokemon/pikachu"
 
-    def test_pokemon_name_case_insensitive(self, mocker):
+    def test_pokemon_name_case_insensitive(self, mock_api):
         """Test that Pokemon names are converted to lowercase"""
-        mock_response = Mock()
-        mock_response.json.return_value = {"name": "charizard"}
-        mock_response.raise_for_status.return_value = None
-        mocker.patch('requests.get', return_value=mock_response)
+        mock_api.add(responses.GET, POKEAPI_URL + "charizard", json={"name": "charizard"})
 
         # Test with uppercase name
         get_pokemon_data("CHARIZARD")
 
         # Verify lowercase conversion
-        requests.get.assert_called_once_with("https://pokeapi.co/api/v2/pokemon/charizard")
+        assert len(mock_api.calls) == 1
+        assert mock_api.calls[0].request.url == "https://pokeapi.co/api/v2/pokemon/charizard"
 
-    def test_pokemon_name_mixed_case(self, mocker):
+    def test_pokemon_name_mixed_case(self, mock_api):
         """Test that mixed case Pokemon names are handled correctly"""
-        mock_response = Mock()
-        mock_response.json.return_value = {"name": "bulbasaur"}
-        mock_response.raise_for_status.return_value = None
-        mocker.patch('requests.get', return_value=mock_response)
+        mock_api.add(responses.GET, POKEAPI_URL + "bulbasaur", json={"name": "bulbasaur"})
 
         # Test with mixed case
         get_pokemon_data("BuLbAsAuR")
 
         # Verify lowercase conversion
-        requests.get.assert_called_once_with("https://pokeapi.co/api/v2/pokemon/bulbasaur")
+        assert len(mock_api.calls) == 1
+        assert mock_api.calls[0].request.url == "https://pokeapi.co/api/v2/pokemon/bulbasaur"
+
+    def test_invalid_json_body(self, mock_api, capsys):
+        """Test that a response body that isn't valid JSON is handled"""
+        mock_api.add(responses.GET, POKEAPI_URL + "pikachu", body="<html>Service Unavailable</html>")
+
+        result = get_pokemon_data("pikachu")
+
+        assert result is None
+        captured = capsys.readouterr()
+        assert "Error fetching Pokemon data" in captured.out
 
-    def test_http_error_404(self, mocker, capsys):
+    def test_http_error_404(self, mock_api, capsys):
         """Test handling of 404 error (Pokemon not found)"""
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("404 Not Found")
-        mocker.patch('requests.get', return_value=mock_response)
+        mock_api.add(responses.GET, POKEAPI_URL + "notapokemon", body="Not Found", status=404)
 
         result = get_pokemon_data("notapokemon")
 
@@ -76,9 +88,12 @@ class TestGetPokemonData:
         captured = capsys.readouterr()
         assert "Error fetching Pokemon data" in captured.out
 
-    def test_connection_error(self, mocker, capsys):
+    def test_connection_error(self, mock_api, capsys):
         """Test handling of connection errors"""
-        mocker.patch('requests.get', side_effect=requests.exceptions.ConnectionError("Connection failed"))
+        mock_api.add(
+            responses.GET, POKEAPI_URL + "pikachu",
+            body=requests.exceptions.ConnectionError("Connection failed"),
+        )
 
         result = get_pokemon_data("pikachu")
 
@@ -86,9 +101,12 @@ class TestGetPokemonData:
         captured = capsys.readouterr()
         assert "Error fetching Pokemon data" in captured.out
 
-    def test_timeout_error(self, mocker, capsys):
+    def test_timeout_error(self, mock_api, capsys):
         """Test handling of timeout errors"""
-        mocker.patch('requests.get', side_effect=requests.exceptions.Timeout("Request timeout"))
+        mock_api.add(
+            responses.GET, POKEAPI_URL + "pikachu",
+            body=requests.exceptions.Timeout("Request timeout"),
+        )
 
         result = get_pokemon_data("pikachu")
 
@@ -96,9 +114,12 @@ class TestGetPokemonData:
         captured = capsys.readouterr()
         assert "Error fetching Pokemon data" in captured.out
 
-    def test_generic_request_exception(self, mocker, capsys):
+    def test_generic_request_exception(self, mock_api, capsys):
         """Test handling of generic request exceptions"""
-        mocker.patch('requests.get', side_effect=requests.exceptions.RequestException("Generic error"))
+        mock_api.add(
+            responses.GET, POKEAPI_URL + "pikachu",
+            body=requests.exceptions.RequestException("Generic error"),
+        )
 
         result = get_pokemon_data("pikachu")
 
@@ -106,19 +127,16 @@ class TestGetPokemonData:
         captured = capsys.readouterr()
         assert "Error fetching Pokemon data" in captured.out
 
-    def test_returns_dictionary_type(self, mocker):
+    def test_returns_dictionary_type(self, mock_api):
         """Test that the function returns a dictionary when successful"""
         mock_data = {"name": "mewtwo", "height": 20, "weight": 1220}
-        mock_response = Mock()
-        mock_response.json.return_value = mock_data
-        mock_response.raise_for_status.return_value = None
-        mocker.patch('requests.get', return_value=mock_response)
+        mock_api.add(responses.GET, POKEAPI_URL + "mewtwo", json=mock_data)
 
         result = get_pokemon_data("mewtwo")
 
         assert isinstance(result, dict)
 
-    def test_complex_pokemon_data(self, mocker):
+    def test_complex_pokemon_data(self, mock_api):
         """Test with complex Pokemon data including multiple types"""
         mock_data = {
             "name": "charizard",
@@ -136,10 +154,7 @@ class TestGetPokemonData:
             ]
         }
 
-        mock_response = Mock()
-        mock_response.json.return_value = mock_data
-        mock_response.raise_for_status.return_value = None
-        mocker.patch('requests.get', return_value=mock_response)
+        mock_api.add(responses.GET, POKEAPI_URL + "charizard", json=mock_data)
 
         result = get_pokemon_data("charizard")
 
@@ -151,3 +166,36 @@ class TestGetPokemonData:
         assert "abilities" in result
         assert "stats" in result
 
+    def test_repeat_lookups_are_cached(self, mock_api):
+        """Test that the same Pokemon is only fetched once, regardless of case"""
+        mock_api.add(responses.GET, POKEAPI_URL + "pikachu", json={"name": "pikachu"})
+
+        first = get_pokemon_data("pikachu")
+        second = get_pokemon_data("PIKACHU")
+
+        assert first == second == {"name": "pikachu"}
+        assert len(mock_api.calls) == 1
+
+    def test_cached_result_is_not_shared(self, mock_api):
+        """Test that modifying a returned dict doesn't change later lookups"""
+        mock_api.add(responses.GET, POKEAPI_URL + "pikachu", json={
+            "name": "pikachu",
+            "types": [{"type": {"name": "electric"}}]
+        })
+
+        first = get_pokemon_data("pikachu")
+        first["name"] = "raichu"
+        first["types"].append({"type": {"name": "fairy"}})
+        second = get_pokemon_data("pikachu")
+
+        assert second == {"name": "pikachu", "types": [{"type": {"name": "electric"}}]}
+        assert len(mock_api.calls) == 1
+
+    def test_failed_lookup_is_not_cached(self, mock_api):
+        """Test that a failed fetch is retried on the next call"""
+        mock_api.add(responses.GET, POKEAPI_URL + "pikachu", body="Server Error", status=500)
+        mock_api.add(responses.GET, POKEAPI_URL + "pikachu", json={"name": "pikachu"})
+
+        assert get_pokemon_data("pikachu") is None
+        assert get_pokemon_data("pikachu") == {"name": "pikachu"}
+        assert len(mock_api.calls) == 2
@@ -0,0 +1,288 @@
+import pytest
+import requests
+import responses
+import scrape_senators
+from scrape_senators import (
+    WIKI_API,
+    WIKI_BASE,
+    _website_from_wikitext,
+    get_senate_website,
+    get_senate_websites,
+    get_senators,
+    get_websites_from_api,
+)
+
+LIST_URL = f"{WIKI_BASE}/wiki/List_of_current_United_States_senators"
+
+
+def api_page(title, wikitext):
+    """Build one page entry of a formatversion=2 revisions query"""
+    return {"title": title, "revisions": [{"slots": {"main": {"content": wikitext}}}]}
+
+
+def infobox(website_line):
+    """Wrap a website field in a minimal infobox followed by article text"""
+    return "{{Infobox officeholder\n| name = Someone\n" + website_line + "\n}}\nSomeone is a senator.\n"
+
+
+class TestWebsiteFromWikitext:
+    """Test suite for the _website_from_wikitext function"""
+
+    def test_bare_url(self):
+        """Test a website field holding a plain URL"""
+        assert _website_from_wikitext(infobox("| website = https://www.king.senate.gov")) == "https://www.king.senate.gov"
+
+    def test_bracketed_url(self):
+        """Test a website field holding an external link with a label"""
+        wikitext = infobox("| website = [https://www.king.senate.gov Senate website]")
+        assert _website_from_wikitext(wikitext) == "https://www.king.senate.gov"
+
+    def test_url_template_without_scheme(self):
+        """Test that {{URL|...}} without a scheme gets https:// added"""
+        wikitext = infobox("| website = {{URL|britt.senate.gov|Senate website}}")
+        assert _website_from_wikitext(wikitext) == "https://britt.senate.gov"
+
+    def test_url_template_with_scheme(self):
+        """Test that {{URL|...}} with a scheme is returned as written"""
+        wikitext = infobox("|website={{URL|https://www.britt.senate.gov/}}")
+        assert _website_from_wikitext(wikitext) == "https://www.britt.senate.gov/"
+
+    def test_url_template_named_parameter(self):
+        """Test that the named-parameter form {{URL|1=...}} yields just the address"""
+        wikitext = infobox("| website = {{URL|1=www.britt.senate.gov|Senate website}}")
+        assert _website_from_wikitext(wikitext) == "https://www.britt.senate.gov"
+
+    def test_official_url_template_is_a_miss(self):
+        """Test that {{Official URL}} (filled in from Wikidata) is not treated as a URL"""
+        assert _website_from_wikitext(infobox("| website = {{Official URL}}")) == ""
+
+    def test_empty_field_is_a_miss(self):
+        """Test that an empty website field doesn't pick up the next line's URL"""
+        wikitext = infobox("| website =\n| footnotes = see [https://example.org/cite foo]")
+        assert _website_from_wikitext(wikitext) == ""
+
+    def test_citation_below_lead_is_ignored(self):
+        """Test that |website= inside a citation after the first heading can't match"""
+        wikitext = infobox("| party = Republican") + "== Career ==\n{{cite web\n|website=https://example.org\n}}\n"
+        assert _website_from_wikitext(wikitext) == ""
+
+    def test_missing_field(self):
+        """Test wikitext with no website field at all"""
+        assert _website_from_wikitext(infobox("| party = Independent")) == ""
+        assert _website_from_wikitext("") == ""
+
+
+class TestGetWebsitesFromApi:
+    """Test suite for the get_websites_from_api function"""
+
+    def test_maps_normalized_and_redirected_titles(self, mock_api):
+        """Test that answers under normalized or redirected titles map back to their paths"""
+        mock_api.add(responses.GET, WIKI_API, json={
+            "query": {
+                "normalized": [{"from": "katie britt", "to": "Katie britt"}],
+                "redirects": [{"from": "Katie britt", "to": "Katie Britt"}],
+                "pages": [
+                    api_page("Katie Britt", infobox("| website = {{URL|britt.senate.gov}}")),
+                    api_page("Angus King", infobox("| website = https://www.king.senate.gov")),
+                ],
+            },
+        })
+
+        result = get_websites_from_api(["/wiki/katie_britt", "/wiki/Angus_King"])
+
+        assert result == {
+            "/wiki/katie_britt": "https://britt.senate.gov",
+            "/wiki/Angus_King": "https://www.king.senate.gov",
+        }
+        assert len(mock_api.calls) == 1
+        assert "titles=katie+britt%7CAngus+King" in mock_api.calls[0].request.url
+
+    def test_percent_encoded_path(self, mock_api):
+        """Test that percent-encoded paths are decoded into page titles"""
+        mock_api.add(responses.GET, WIKI_API, json={
+            "query": {"pages": [api_page("Ben Ray Luján", infobox("| website = https://www.lujan.senate.gov"))]},
+        })
+
+        result = get_websites_from_api(["/wiki/Ben_Ray_Luj%C3%A1n"])
+
+        assert result == {"/wiki/Ben_Ray_Luj%C3%A1n": "https://www.lujan.senate.gov"}
+
+    def test_follows_continuation(self, mock_api):
+        """Test that a batch split across continued responses is fully read"""
+        mock_api.add(responses.GET, WIKI_API, json={
+            "continue": {"rvcontinue": "123|456", "continue": "||"},
+            "query": {"pages": [
+                api_page("Angus King", infobox("| website = https://www.king.senate.gov")),
+                {"title": "Katie Britt"},
+            ]},
+        })
+        mock_api.add(responses.GET, WIKI_API, json={
+            "query": {"pages": [api_page("Katie Britt", infobox("| website = {{URL|britt.senate.gov}}"))]},
+        })
+
+        result = get_websites_from_api(["/wiki/Angus_King", "/wiki/Katie_Britt"])
+
+        assert result == {
+            "/wiki/Angus_King": "https://www.king.senate.gov",
+            "/wiki/Katie_Britt": "https://britt.senate.gov",
+        }
+        assert len(mock_api.calls) == 2
+        assert "rvcontinue=123%7C456" in mock_api.calls[1].request.url
+
+    def test_pages_without_content_are_left_out(self, mock_api):
+        """Test that missing pages and hidden revisions are misses, not errors"""
+        mock_api.add(responses.GET, WIKI_API, json={
+            "query": {"pages": [
+                {"title": "Angus King", "revisions": [{"slots": {"main": {"texthidden": True}}}]},
+                {"title": "Nobody", "missing": True},
+            ]},
+        })
+
+        assert get_websites_from_api(["/wiki/Angus_King", "/wiki/Nobody"]) == {}
+
+
+class TestGetSenateWebsite:
+    """Test suite for the get_senate_website function"""
+
+    def test_link_next_to_website_header(self, mock_api):
+        """Test that the link in the cell after the "Website" header is returned"""
+        mock_api.add(
+            responses.GET, f"{WIKI_BASE}/wiki/Angus_King",
+            body='<p><a href="https://example.org">article link</a></p>'
+                 '<table class="infobox vcard"><tr><th>Party</th><td><a href="/wiki/Independent">Independent</a></td></tr>'
+                 '<tr><th>Website</th><td><a href="https://www.king.senate.gov">Senate website</a></td></tr></table>',
+        )
+
+        assert get_senate_website("/wiki/Angus_King") == "https://www.king.senate.gov"
+        assert mock_api.calls[0].request.headers["User-Agent"] == scrape_senators.HEADERS["User-Agent"]
+
+    def test_website_header_without_link(self, mock_api):
+        """Test that a "Website" cell holding plain text gives "" rather than a link from another row"""
+        mock_api.add(
+            responses.GET, f"{WIKI_BASE}/wiki/Angus_King",
+            body='<table class="infobox"><tr><th>Website</th><td>Official website</td></tr>'
+                 '<tr><th>Signature</th><td><a href="/wiki/File:Signature.svg">signature</a></td></tr></table>',
+        )
+
+        assert get_senate_website("/wiki/Angus_King") == ""
+
+    def test_page_without_infobox(self, mock_api):
+        """Test that a website table outside the infobox is ignored"""
+        mock_api.add(
+            responses.GET, f"{WIKI_BASE}/wiki/Angus_King",
+            body='<table class="wikitable"><tr><th>Website</th>'
+                 '<td><a href="https://example.org">elsewhere</a></td></tr></table>',
+        )
+
+        assert get_senate_website("/wiki/Angus_King") == ""
+
+    def test_http_error(self, mock_api):
+        """Test that a failed page request raises, leaving the warning to get_senate_websites"""
+        mock_api.add(responses.GET, f"{WIKI_BASE}/wiki/Nobody", body="Not Found", status=404)
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            get_senate_website("/wiki/Nobody")
+
+
+class TestGetSenateWebsites:
+    """Test suite for the get_senate_websites function"""
+
+    def test_api_miss_falls_back_to_page_scrape(self, mock_api):
+        """Test that senators the API can't answer for are scraped from their page"""
+        mock_api.add(responses.GET, WIKI_API, json={
+            "query": {"pages": [
+                api_page("Angus King", infobox("| website = https://www.king.senate.gov")),
+                api_page("Katie Britt", infobox("| website = {{Official URL}}")),
+            ]},
+        })
+        mock_api.add(
+            responses.GET, f"{WIKI_BASE}/wiki/Katie_Britt",
+            body='<table class="infobox vcard"><tr><th>Website</th>'
+                 '<td><a href="https://www.britt.senate.gov">Senate website</a></td></tr></table>',
+        )
+
+        result = get_senate_websites(["/wiki/Angus_King", "", "/wiki/Katie_Britt"])
+
+        assert result == ["https://www.king.senate.gov", "", "https://www.britt.senate.gov"]
+
+    def test_api_failure_falls_back_for_everyone(self, mock_api, capsys):
+        """Test that a failed API call scrapes every page instead"""
+        mock_api.add(responses.GET, WIKI_API, body=requests.exceptions.ConnectionError("API down"))
+        mock_api.add(
+            responses.GET, f"{WIKI_BASE}/wiki/Angus_King",
+            body='<table class="infobox"><tr><th>Website</th>'
+                 '<td><a href="https://www.king.senate.gov">Senate website</a></td></tr></table>',
+        )
+
+        result = get_senate_websites(["/wiki/Angus_King"])
+
+        assert result == ["https://www.king.senate.gov"]
+        captured = capsys.readouterr()
+        assert "MediaWiki API lookup failed" in captured.out
+
+
+LEADERSHIP_TABLE = '<table class="wikitable sortable"><tr><th>Leader</th></tr><tr><td>Someone</td></tr></table>'
+
+
+def senators_page():
+    """Build a cut-down senators list page: three leadership tables, the senators table, then the footnotes"""
+    leadership = LEADERSHIP_TABLE * 3
+    rows = (
+        '<tr><td rowspan="2"><a href="/wiki/Maine">Maine</a></td><td><img src="collins.jpg"></td>'
+        '<th><a href="/wiki/Susan_Collins">Susan Collins</a></th><td style="background:red"></td>'
+        '<td>Republican</td><td>1997</td></tr>'
+        '<tr><td><img src="king.jpg"><ul><li>portrait</li></ul></td>'
+        '<th><a href="/wiki/Angus_King">Angus King</a></th><td style="background:gray"></td>'
+        '<td>Independent<sup><a href="#cite_note-caucus-2">[a]</a></sup></td><td>2013</td></tr>'
+    )
+    senators = (
+        '<table class="wikitable sortable"><thead><tr><th>State</th><th>Senator</th></tr></thead>'
+        f"<tbody>{rows}</tbody></table>"
+    )
+    footnotes = (
+        '<ol class="references">'
+        '<li id="cite_note-other-1"><span class="reference-text">Not cited by any senator</span></li>'
+        '<li id="cite_note-caucus-2"><span class="mw-cite-backlink">^ a b</span> '
+        '<span class="reference-text">Caucuses with the Democrats.<sup>[15]</sup> [ 3 ]</span></li></ol>'
+    )
+    return f"<html><body><p>Intro</p>{leadership}<h2>Senators</h2>{senators}<h2>Notes</h2>{footnotes}</body></html>"
+
+
+class TestGetSenators:
+    """Test suite for the get_senators function"""
+
+    @pytest.mark.parametrize("chunk_size", [7, scrape_senators.PARSE_CHUNK_SIZE])
+    def test_streams_rows_and_footnotes(self, mock_api, monkeypatch, chunk_size):
+        """Test that rows and their footnotes are read, however the page download is split up"""
+        monkeypatch.setattr(scrape_senators, "PARSE_CHUNK_SIZE", chunk_size)
+        mock_api.add(responses.GET, LIST_URL, body=senators_page())
+        mock_api.add(responses.GET, WIKI_API, json={
+            "query": {"pages": [
+                api_page("Susan Collins", infobox("| website = https://www.collins.senate.gov")),
+                api_page("Angus King", infobox("| website = https://www.king.senate.gov")),
+            ]},
+        })
+
+        result = get_senators()
+
+        assert result == {
+            "name": ["Susan Collins", "Angus King"],
+            "state": ["Maine", "Maine"],
+            "party": ["Republican", "Independent"],
+            "website": ["https://www.collins.senate.gov", "https://www.king.senate.gov"],
+            "notes": ["", "Caucuses with the Democrats."],
+        }
+
+    def test_missing_senators_table(self, mock_api):
+        """Test that a page without a fourth sortable table raises instead of returning no senators"""
+        mock_api.add(responses.GET, LIST_URL, body=f"<html><body>{LEADERSHIP_TABLE * 3}</body></html>")
+
+        with pytest.raises(ValueError, match="found 3"):
+            get_senators()
+
+    def test_http_error(self, mock_api):
+        """Test that a failed list page request raises"""
+        mock_api.add(responses.GET, LIST_URL, body="Not Found", status=404)
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            get_senators()